@@ -13,8 +13,10 @@ test_bgp-vrf-route-leak-basic.py.py: Test basic vrf route leaking
 """
 
 import os
+import select
+import subprocess
 import sys
-from functools import partial
+import time
 import pytest
 
 CWD = os.path.dirname(os.path.realpath(__file__))
@@ -22,23 +24,576 @@ sys.path.append(os.path.join(CWD, "../"))
 
 # pylint: disable=C0413
 from lib import topotest
-from lib.topogen import Topogen, TopoRouter, get_topogen
+from lib.topogen import Topogen, TopoRouter
 from lib.topolog import logger
 from lib.checkping import check_ping
 
 pytestmark = [pytest.mark.bgpd]
 
 
+# Overall convergence budget per check.  These scenarios settle within a
+# couple of seconds, and before the backoff conversion each poll allowed
+# 5s (10 probes at 0.5s); 10s keeps a 2x margin for slow CI machines
+# without letting a failing check burn 30s.
+POLL_DEADLINE = 10.0
+
+
+def run_and_expect_backoff(func, deadline=POLL_DEADLINE, initial=0.05, cap=1.0):
+    """
+    Poll `func` until it returns None or `deadline` seconds have elapsed.
+
+    Unlike topotest.run_and_expect this starts with a short `initial` probe
+    interval and grows it exponentially up to `cap` seconds, so runs that
+    converge quickly are detected after a few cheap probes while failing
+    runs stay bounded by the overall deadline.
+
+    Returns (True, func-return) on success or (False, func-return) on
+    failure, like topotest.run_and_expect.
+    """
+    start_time = time.monotonic()
+    wait = initial
+    while True:
+        result = func()
+        if result is None:
+            logger.debug(
+                "polling succeeded after {:.2f} seconds".format(
+                    time.monotonic() - start_time
+                )
+            )
+            return (True, result)
+        if time.monotonic() - start_time > deadline:
+            logger.error(
+                "polling failed after {:.2f} seconds".format(
+                    time.monotonic() - start_time
+                )
+            )
+            return (False, result)
+        time.sleep(wait)
+        wait = min(cap, wait * 1.5)
+
+
+# Expected steady-state routing tables.  Built once at module load so the
+# polling loops do not reconstruct them on every test invocation.
+DONNA_EXPECT = {
+    "10.0.0.0/24": [
+        {
+            "protocol": "connected",
+        }
+    ],
+    "10.0.1.0/24": [
+        {
+            "protocol": "bgp",
+            "selected": True,
+            "nexthops": [
+                {
+                    "fib": True,
+                    "interfaceName": "EVA",
+                    "vrf": "EVA",
+                    "active": True,
+                },
+            ],
+        },
+    ],
+    "10.0.2.0/24": [{"protocol": "connected"}],
+    "10.0.3.0/24": [
+        {
+            "protocol": "bgp",
+            "selected": True,
+            "nexthops": [
+                {
+                    "fib": True,
+                    "interfaceName": "EVA",
+                    "vrf": "EVA",
+                    "active": True,
+                },
+            ],
+        },
+    ],
+    "10.0.4.0/24": [
+        {
+            "protocol": "bgp",
+            "selected": True,
+            "nexthops": [
+                {
+                    "fib": True,
+                    "interfaceName": "lo",
+                    "vrf": "default",
+                    "active": True,
+                },
+            ],
+        },
+    ],
+    "172.16.101.0/24": [
+        {
+            "protocol": "bgp",
+            "selected": None,
+            "nexthops": [
+                {
+                    "fib": None,
+                    "interfaceName": "unknown",
+                    "vrf": "Unknown",
+                    "active": None,
+                },
+            ],
+        },
+    ],
+}
+
+EVA_EXPECT = {
+    "10.0.0.0/24": [
+        {
+            "protocol": "bgp",
+            "selected": True,
+            "nexthops": [
+                {
+                    "fib": True,
+                    "interfaceName": "DONNA",
+                    "vrf": "DONNA",
+                    "active": True,
+                },
+            ],
+        },
+    ],
+    "10.0.1.0/24": [
+        {
+            "protocol": "connected",
+        }
+    ],
+    "10.0.2.0/24": [
+        {
+            "protocol": "bgp",
+            "selected": True,
+            "nexthops": [
+                {
+                    "fib": True,
+                    "interfaceName": "DONNA",
+                    "vrf": "DONNA",
+                    "active": True,
+                },
+            ],
+        },
+    ],
+    "10.0.3.0/24": [
+        {
+            "protocol": "connected",
+        }
+    ],
+    "172.16.101.0/24": [
+        {
+            "protocol": "bgp",
+            "selected": None,
+            "nexthops": [
+                {
+                    "fib": None,
+                    "interfaceName": "unknown",
+                    "vrf": "Unknown",
+                    "active": None,
+                },
+            ],
+        },
+    ],
+}
+
+DEFAULT_EXPECT = {
+    "10.0.0.0/24": [
+        {
+            "protocol": "bgp",
+            "selected": True,
+            "nexthops": [
+                {
+                    "fib": True,
+                    "interfaceName": "DONNA",
+                    "vrf": "DONNA",
+                    "active": True,
+                },
+            ],
+        },
+    ],
+    "10.0.2.0/24": [
+        {
+            "protocol": "bgp",
+            "selected": True,
+            "nexthops": [
+                {
+                    "fib": True,
+                    "interfaceName": "DONNA",
+                    "vrf": "DONNA",
+                    "active": True,
+                },
+            ],
+        },
+    ],
+    "10.0.4.0/24": [
+        {
+            "protocol": "connected",
+        }
+    ],
+}
+
+ALL_VRF_EXPECTS = {
+    "DONNA": DONNA_EXPECT,
+    "EVA": EVA_EXPECT,
+    "default": DEFAULT_EXPECT,
+}
+
+
+def compile_expect(expect):
+    """
+    Precompile `expect` into a flat form: the frozenset of dict keys that
+    must be present somewhere in a matching output and the frozenset of
+    (key, scalar-value) pairs the output must contain.
+
+    Both sets are necessary (not sufficient) conditions for a json_cmp
+    match, which makes them a cheap reject test that avoids the full
+    recursive diff while the router has not converged yet.  None and '*'
+    values carry no such requirement and are skipped.
+    """
+    keys = set()
+    pairs = set()
+
+    def walk(node):
+        if isinstance(node, dict):
+            for k, v in node.items():
+                if v is None:
+                    continue
+                keys.add(k)
+                if v == "*":
+                    continue
+                if isinstance(v, (dict, list)):
+                    walk(v)
+                else:
+                    pairs.add((k, v))
+        elif isinstance(node, list):
+            for v in node:
+                walk(v)
+
+    walk(expect)
+    return (frozenset(keys), frozenset(pairs))
+
+
+def prefilter_expect(compiled, output):
+    """
+    Check `output` against a compile_expect() fingerprint.  Returns None
+    when the full json_cmp may succeed, otherwise a short description of
+    what is still missing from the output.
+    """
+    want_keys, want_pairs = compiled
+    keys = set()
+    pairs = set()
+
+    def walk(node):
+        if isinstance(node, dict):
+            for k, v in node.items():
+                keys.add(k)
+                if isinstance(v, (dict, list)):
+                    walk(v)
+                else:
+                    pairs.add((k, v))
+        elif isinstance(node, list):
+            for v in node:
+                walk(v)
+
+    walk(output)
+
+    missing_keys = want_keys - keys
+    if missing_keys:
+        return "output is missing expected keys: {}".format(sorted(missing_keys))
+    missing_pairs = want_pairs - pairs
+    if missing_pairs:
+        return "output is missing expected values: {}".format(
+            sorted(repr(p) for p in missing_pairs)
+        )
+    return None
+
+
+ALL_VRF_COMPILED = {
+    vrf: compile_expect(expect) for vrf, expect in ALL_VRF_EXPECTS.items()
+}
+
+
+def all_vrfs_poll(router, expects, compiled=None):
+    """
+    Build a poll function that compares every VRF expectation in `expects`
+    (vrf name -> expected table) against a single 'show ip route vrf all
+    json' dump, so one vtysh round trip per probe covers all VRFs.
+
+    Like json_poll, the raw dump is fingerprinted between probes so
+    unchanged output is neither re-decoded nor re-diffed.  `compiled`
+    optionally maps vrf names to compile_expect() fingerprints used to
+    reject non-matching tables without running the full diff.
+    """
+    prev_fingerprint = None
+    prev_result = None
+
+    def poll():
+        nonlocal prev_fingerprint, prev_result
+        raw = vtysh_show(router, "show ip route vrf all json")
+        fingerprint = hash(raw)
+        if fingerprint == prev_fingerprint:
+            return prev_result
+        prev_fingerprint = fingerprint
+        try:
+            output = topotest.json_loads(raw)
+        except ValueError:
+            output = {}
+        final = None
+        for vrf, expect in expects.items():
+            table = output.get(vrf, {})
+            result = None
+            if compiled and vrf in compiled:
+                result = prefilter_expect(compiled[vrf], table)
+            if result is None:
+                result = topotest.json_cmp(table, expect)
+            if result is not None:
+                final = "VRF {}: {}".format(vrf, result)
+                break
+        prev_result = final
+        return prev_result
+
+    return poll
+
+
+class VtyshSession:
+    """
+    A vtysh process kept running inside the router, so repeated show
+    commands do not pay a fork/exec round trip per probe.
+
+    When its stdin is a pipe vtysh executes commands line by line, so each
+    command is followed by an 'echo' sentinel and output is consumed up to
+    that sentinel.  Any failure makes cmd() return None so callers can
+    fall back to the one-shot vtysh_cmd; a sentinel timeout marks the
+    session broken so the fallback does not pay the timeout again.
+    """
+
+    _MARKER = "VTYSH_SESSION_DONE"
+    # Must stay well under POLL_DEADLINE: the session is built lazily
+    # inside the first probe, and a sentinel timeout has to leave the
+    # poll enough budget to fall back to the one-shot vtysh_cmd.
+    _TIMEOUT = 2.0
+
+    def __init__(self, router):
+        self.router = router
+        self.proc = None
+        self.broken = False
+
+    def _read_until_marker(self):
+        "Read stdout up to the sentinel line; returns the bytes or None."
+        buf = b""
+        marker = self._MARKER.encode()
+        fd = self.proc.stdout.fileno()
+        deadline = time.monotonic() + self._TIMEOUT
+        while True:
+            if any(line.strip() == marker for line in buf.split(b"\n")[:-1]):
+                return buf
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                # No sentinel: assume the session cannot work at all.
+                self.broken = True
+                self.close()
+                return None
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                self.close()
+                return None
+            buf += chunk
+
+    def _start(self):
+        self.proc = self.router.popen(
+            ["vtysh"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        # Swallow the banner (and verify the sentinel works) before the
+        # first real command.
+        self.proc.stdin.write("echo {}\n".format(self._MARKER))
+        self.proc.stdin.flush()
+        return self._read_until_marker() is not None
+
+    def close(self):
+        if self.proc is not None:
+            try:
+                self.proc.stdin.close()
+                self.proc.terminate()
+                self.proc.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                self.proc.kill()
+                self.proc.wait()
+            self.proc = None
+
+    def cmd(self, command):
+        "Run `command`, returning its output or None when the session failed."
+        if self.broken:
+            return None
+        if self.proc is None or self.proc.poll() is not None:
+            self.proc = None
+            try:
+                if not self._start():
+                    return None
+            except OSError:
+                self.close()
+                return None
+        try:
+            self.proc.stdin.write("{}\necho {}\n".format(command, self._MARKER))
+            self.proc.stdin.flush()
+        except OSError:
+            self.close()
+            return None
+
+        buf = self._read_until_marker()
+        if buf is None:
+            return None
+
+        # Keep only the command output: drop the echoed prompt/command
+        # lines and stop at the sentinel.
+        output = []
+        for line in buf.decode("utf-8", "ignore").splitlines(True):
+            if line.strip() == self._MARKER:
+                break
+            if command in line or self._MARKER in line:
+                continue
+            output.append(line)
+        return "".join(output)
+
+
+_vtysh_sessions = {}
+
+
+def vtysh_show(router, command):
+    """
+    Run a show command through the router's persistent vtysh session,
+    falling back to the one-shot vtysh_cmd when the session is unusable.
+    """
+    session = _vtysh_sessions.get(router.name)
+    if session is None:
+        session = VtyshSession(router)
+        _vtysh_sessions[router.name] = session
+    output = session.cmd(command)
+    if output is None:
+        return router.vtysh_cmd(command)
+    return output
+
+
+def json_poll(router, cmd, expect):
+    """
+    Build a poll function that compares the JSON output of `cmd` on
+    `router` against `expect`, for use with run_and_expect_backoff.
+
+    The raw vtysh output is fingerprinted between probes: while the router
+    keeps returning byte-identical output (the common case when it has not
+    converged yet), the previous comparison result is returned without
+    re-decoding and re-diffing the whole document.
+    """
+    compiled = compile_expect(expect)
+    # Top-level None entries assert key absence, which is a plain
+    # membership test; keep them apart so they never reach the
+    # structural diff.
+    absent_keys = [k for k, v in expect.items() if v is None]
+    absent_tokens = ['"{}"'.format(k) for k in absent_keys]
+    present_expect = {k: v for k, v in expect.items() if v is not None}
+    # Quoted top-level keys the raw output must contain for a match to be
+    # possible.  Checking them on the undecoded text lets clearly
+    # non-matching probes skip the JSON decode entirely.
+    required_tokens = ['"{}"'.format(k) for k in present_expect]
+    prev_fingerprint = None
+    prev_result = None
+
+    def poll():
+        nonlocal prev_fingerprint, prev_result
+        raw = vtysh_show(router, cmd)
+        fingerprint = hash(raw)
+        if fingerprint == prev_fingerprint:
+            return prev_result
+        prev_fingerprint = fingerprint
+        missing = [t for t in required_tokens if t not in raw]
+        if missing:
+            prev_result = "output is missing expected keys: {}".format(missing)
+            return prev_result
+        if not present_expect and not any(t in raw for t in absent_tokens):
+            # Pure absence check and the keys do not even occur in the
+            # raw text: matched, no decode needed.
+            prev_result = None
+            return prev_result
+        try:
+            output = topotest.json_loads(raw)
+        except ValueError:
+            output = {}
+        unexpected = [k for k in absent_keys if k in output]
+        if unexpected:
+            prev_result = "output has unexpected keys: {}".format(unexpected)
+            return prev_result
+        result = None
+        if present_expect:
+            result = prefilter_expect(compiled, output)
+            if result is None:
+                result = topotest.json_cmp(output, present_expect)
+        prev_result = result
+        return prev_result
+
+    return poll
+
+
+_routers_probed = False
+
+
+def routers_have_failure(tgen, force=False):
+    """
+    Wrapper around tgen.routers_have_failure() caching the daemon probe.
+
+    The full check shells into the router to verify that every daemon is
+    still running; back-to-back read-only checks skip it and only consult
+    the accumulated error state.  Tests that follow a router state
+    mutation (interface or VRF changes, the steps that can actually crash
+    a daemon) pass force=True to re-run the full probe, so a mid-module
+    crash still skips the remaining tests with a clear error instead of
+    failing them on route diffs.
+    """
+    global _routers_probed
+    if force or not _routers_probed:
+        _routers_probed = True
+        return tgen.routers_have_failure()
+    return tgen.has_errors()
+
+
+def donna_eva_leak_expect(installed):
+    """
+    DONNA-table expectation for the routes leaked from EVA.  `installed`
+    selects the state after EVA comes up (True) or goes down (None, i.e.
+    the selected/fib/active flags must be absent).
+    """
+    return {
+        prefix: [
+            {
+                "protocol": "bgp",
+                "selected": installed,
+                "nexthops": [
+                    {
+                        "fib": installed,
+                        "interfaceName": "EVA",
+                        "vrf": "EVA",
+                        "active": installed,
+                    },
+                ],
+            },
+        ]
+        for prefix in ("10.0.1.0/24", "10.0.3.0/24")
+    }
+
+
 def build_topo(tgen):
     "Build function"
 
-    for routern in range(1, 2):
-        tgen.add_router("r{}".format(routern))
+    tgen.add_router("r1")
 
 
-def setup_module(mod):
-    "Sets up the pytest environment"
-    tgen = Topogen(build_topo, mod.__name__)
+@pytest.fixture(scope="module")
+def tgen(request):
+    "Setup/Teardown the environment and provide tgen argument to tests"
+
+    global _routers_probed
+    _routers_probed = False
+
+    tgen = Topogen(build_topo, request.module.__name__)
     tgen.start_topology()
 
     # For all registered routers, load the zebra configuration file
@@ -55,243 +610,51 @@ def setup_module(mod):
     tgen.start_router()
     # tgen.mininet_cli()
 
+    yield tgen
 
-def teardown_module(mod):
-    "Teardown the pytest environment"
-    tgen = get_topogen()
+    for session in _vtysh_sessions.values():
+        session.close()
+    _vtysh_sessions.clear()
 
     # This function tears down the whole topology.
     tgen.stop_topology()
 
 
-def test_vrf_route_leak_donna():
-    logger.info("Ensure that routes are leaked back and forth")
-    tgen = get_topogen()
-    # Don't run this test if we have any failure.
-    if tgen.routers_have_failure():
-        pytest.skip(tgen.errors)
-
-    r1 = tgen.gears["r1"]
-
-    # Test DONNA VRF.
-    expect = {
-        "10.0.0.0/24": [
-            {
-                "protocol": "connected",
-            }
-        ],
-        "10.0.1.0/24": [
-            {
-                "protocol": "bgp",
-                "selected": True,
-                "nexthops": [
-                    {
-                        "fib": True,
-                        "interfaceName": "EVA",
-                        "vrf": "EVA",
-                        "active": True,
-                    },
-                ],
-            },
-        ],
-        "10.0.2.0/24": [{"protocol": "connected"}],
-        "10.0.3.0/24": [
-            {
-                "protocol": "bgp",
-                "selected": True,
-                "nexthops": [
-                    {
-                        "fib": True,
-                        "interfaceName": "EVA",
-                        "vrf": "EVA",
-                        "active": True,
-                    },
-                ],
-            },
-        ],
-        "10.0.4.0/24": [
-            {
-                "protocol": "bgp",
-                "selected": True,
-                "nexthops": [
-                    {
-                        "fib": True,
-                        "interfaceName": "lo",
-                        "vrf": "default",
-                        "active": True,
-                    },
-                ],
-            },
-        ],
-        "172.16.101.0/24": [
-            {
-                "protocol": "bgp",
-                "selected": None,
-                "nexthops": [
-                    {
-                        "fib": None,
-                        "interfaceName": "unknown",
-                        "vrf": "Unknown",
-                        "active": None,
-                    },
-                ],
-            },
-        ],
-    }
-
-    test_func = partial(
-        topotest.router_json_cmp, r1, "show ip route vrf DONNA json", expect
-    )
-    result, diff = topotest.run_and_expect(test_func, None, count=10, wait=0.5)
-    assert result, "BGP VRF DONNA check failed:\n{}".format(diff)
-
-
-def test_vrf_route_leak_eva():
-    logger.info("Ensure that routes are leaked back and forth")
-    tgen = get_topogen()
-    # Don't run this test if we have any failure.
-    if tgen.routers_have_failure():
-        pytest.skip(tgen.errors)
-
-    r1 = tgen.gears["r1"]
-
-    # Test EVA VRF.
-    expect = {
-        "10.0.0.0/24": [
-            {
-                "protocol": "bgp",
-                "selected": True,
-                "nexthops": [
-                    {
-                        "fib": True,
-                        "interfaceName": "DONNA",
-                        "vrf": "DONNA",
-                        "active": True,
-                    },
-                ],
-            },
-        ],
-        "10.0.1.0/24": [
-            {
-                "protocol": "connected",
-            }
-        ],
-        "10.0.2.0/24": [
-            {
-                "protocol": "bgp",
-                "selected": True,
-                "nexthops": [
-                    {
-                        "fib": True,
-                        "interfaceName": "DONNA",
-                        "vrf": "DONNA",
-                        "active": True,
-                    },
-                ],
-            },
-        ],
-        "10.0.3.0/24": [
-            {
-                "protocol": "connected",
-            }
-        ],
-        "172.16.101.0/24": [
-            {
-                "protocol": "bgp",
-                "selected": None,
-                "nexthops": [
-                    {
-                        "fib": None,
-                        "interfaceName": "unknown",
-                        "vrf": "Unknown",
-                        "active": None,
-                    },
-                ],
-            },
-        ],
-    }
-
-    test_func = partial(
-        topotest.router_json_cmp, r1, "show ip route vrf EVA json", expect
-    )
-    result, diff = topotest.run_and_expect(test_func, None, count=10, wait=0.5)
-    assert result, "BGP VRF EVA check failed:\n{}".format(diff)
+@pytest.fixture(scope="module")
+def r1(tgen):
+    "The single router under test, resolved once per module"
+    return tgen.gears["r1"]
 
 
-def test_vrf_route_leak_default():
+def test_vrf_route_leak_all_vrfs(tgen, r1):
     logger.info("Ensure that routes are leaked back and forth")
-    tgen = get_topogen()
     # Don't run this test if we have any failure.
-    if tgen.routers_have_failure():
+    if routers_have_failure(tgen):
         pytest.skip(tgen.errors)
 
-    r1 = tgen.gears["r1"]
-
-    # Test default VRF.
-    expect = {
-        "10.0.0.0/24": [
-            {
-                "protocol": "bgp",
-                "selected": True,
-                "nexthops": [
-                    {
-                        "fib": True,
-                        "interfaceName": "DONNA",
-                        "vrf": "DONNA",
-                        "active": True,
-                    },
-                ],
-            },
-        ],
-        "10.0.2.0/24": [
-            {
-                "protocol": "bgp",
-                "selected": True,
-                "nexthops": [
-                    {
-                        "fib": True,
-                        "interfaceName": "DONNA",
-                        "vrf": "DONNA",
-                        "active": True,
-                    },
-                ],
-            },
-        ],
-        "10.0.4.0/24": [
-            {
-                "protocol": "connected",
-            }
-        ],
-    }
-
-    test_func = partial(topotest.router_json_cmp, r1, "show ip route json", expect)
-    result, diff = topotest.run_and_expect(test_func, None, count=10, wait=0.5)
-    assert result, "BGP VRF default check failed:\n{}".format(diff)
+    # Test the DONNA, EVA and default VRFs with a shared poll.
+    test_func = all_vrfs_poll(r1, ALL_VRF_EXPECTS, ALL_VRF_COMPILED)
+    result, diff = run_and_expect_backoff(test_func)
+    assert result, "BGP VRF route leak check failed:\n{}".format(diff)
 
 
-def test_ping():
+def test_ping(tgen, r1):
     "Simple ping tests"
 
-    tgen = get_topogen()
-
     # Don't run this test if we have any failure.
-    if tgen.routers_have_failure():
+    if routers_have_failure(tgen):
         pytest.skip(tgen.errors)
 
-    r1 = tgen.gears["r1"]
-
     logger.info("Ping from default to DONNA")
     check_ping("r1", "10.0.0.1", True, 10, 0.5, source_addr="10.0.4.1")
 
 
-def test_vrf_route_leak_donna_after_eva_down():
+def test_vrf_route_leak_donna_after_eva_down(tgen, r1):
     logger.info("Ensure that route states change after EVA interface goes down")
-    tgen = get_topogen()
     # Don't run this test if we have any failure.
-    if tgen.routers_have_failure():
+    if routers_have_failure(tgen, force=True):
         pytest.skip(tgen.errors)
 
-    r1 = tgen.gears["r1"]
     r1.vtysh_cmd(
         """
 configure
@@ -301,52 +664,19 @@ interface EVA
     )
 
     # Test DONNA VRF.
-    expect = {
-        "10.0.1.0/24": [
-            {
-                "protocol": "bgp",
-                "selected": None,
-                "nexthops": [
-                    {
-                        "fib": None,
-                        "interfaceName": "EVA",
-                        "vrf": "EVA",
-                        "active": None,
-                    },
-                ],
-            },
-        ],
-        "10.0.3.0/24": [
-            {
-                "protocol": "bgp",
-                "selected": None,
-                "nexthops": [
-                    {
-                        "fib": None,
-                        "interfaceName": "EVA",
-                        "vrf": "EVA",
-                        "active": None,
-                    },
-                ],
-            },
-        ],
-    }
-
-    test_func = partial(
-        topotest.router_json_cmp, r1, "show ip route vrf DONNA json", expect
+    test_func = json_poll(
+        r1, "show ip route vrf DONNA json", donna_eva_leak_expect(None)
     )
-    result, diff = topotest.run_and_expect(test_func, None, count=10, wait=0.5)
+    result, diff = run_and_expect_backoff(test_func)
     assert result, "BGP VRF DONNA check failed:\n{}".format(diff)
 
 
-def test_vrf_route_leak_donna_after_eva_up():
+def test_vrf_route_leak_donna_after_eva_up(tgen, r1):
     logger.info("Ensure that route states change after EVA interface goes up")
-    tgen = get_topogen()
     # Don't run this test if we have any failure.
-    if tgen.routers_have_failure():
+    if routers_have_failure(tgen, force=True):
         pytest.skip(tgen.errors)
 
-    r1 = tgen.gears["r1"]
     r1.vtysh_cmd(
         """
 configure
@@ -356,52 +686,19 @@ interface EVA
     )
 
     # Test DONNA VRF.
-    expect = {
-        "10.0.1.0/24": [
-            {
-                "protocol": "bgp",
-                "selected": True,
-                "nexthops": [
-                    {
-                        "fib": True,
-                        "interfaceName": "EVA",
-                        "vrf": "EVA",
-                        "active": True,
-                    },
-                ],
-            },
-        ],
-        "10.0.3.0/24": [
-            {
-                "protocol": "bgp",
-                "selected": True,
-                "nexthops": [
-                    {
-                        "fib": True,
-                        "interfaceName": "EVA",
-                        "vrf": "EVA",
-                        "active": True,
-                    },
-                ],
-            },
-        ],
-    }
-
-    test_func = partial(
-        topotest.router_json_cmp, r1, "show ip route vrf DONNA json", expect
+    test_func = json_poll(
+        r1, "show ip route vrf DONNA json", donna_eva_leak_expect(True)
     )
-    result, diff = topotest.run_and_expect(test_func, None, count=10, wait=0.5)
+    result, diff = run_and_expect_backoff(test_func)
     assert result, "BGP VRF DONNA check failed:\n{}".format(diff)
 
 
-def test_vrf_route_leak_donna_add_vrf_zita():
+def test_vrf_route_leak_donna_add_vrf_zita(tgen, r1):
     logger.info("Add VRF ZITA and ensure that the route from VRF ZITA is updated")
-    tgen = get_topogen()
     # Don't run this test if we have any failure.
-    if tgen.routers_have_failure():
+    if routers_have_failure(tgen, force=True):
         pytest.skip(tgen.errors)
 
-    r1 = tgen.gears["r1"]
     r1.cmd("ip link add ZITA type vrf table 1003")
 
     # Test DONNA VRF.
@@ -422,21 +719,17 @@ def test_vrf_route_leak_donna_add_vrf_zita():
         ],
     }
 
-    test_func = partial(
-        topotest.router_json_cmp, r1, "show ip route vrf DONNA json", expect
-    )
-    result, diff = topotest.run_and_expect(test_func, None, count=10, wait=0.5)
+    test_func = json_poll(r1, "show ip route vrf DONNA json", expect)
+    result, diff = run_and_expect_backoff(test_func)
     assert result, "BGP VRF DONNA check failed:\n{}".format(diff)
 
 
-def test_vrf_route_leak_donna_set_zita_up():
+def test_vrf_route_leak_donna_set_zita_up(tgen, r1):
     logger.info("Set VRF ZITA up and ensure that the route from VRF ZITA is updated")
-    tgen = get_topogen()
     # Don't run this test if we have any failure.
-    if tgen.routers_have_failure():
+    if routers_have_failure(tgen, force=True):
         pytest.skip(tgen.errors)
 
-    r1 = tgen.gears["r1"]
     r1.vtysh_cmd(
         """
 configure
@@ -463,21 +756,17 @@ interface ZITA
         ],
     }
 
-    test_func = partial(
-        topotest.router_json_cmp, r1, "show ip route vrf DONNA json", expect
-    )
-    result, diff = topotest.run_and_expect(test_func, None, count=10, wait=0.5)
+    test_func = json_poll(r1, "show ip route vrf DONNA json", expect)
+    result, diff = run_and_expect_backoff(test_func)
     assert result, "BGP VRF DONNA check failed:\n{}".format(diff)
 
 
-def test_vrf_route_leak_donna_delete_vrf_zita():
+def test_vrf_route_leak_donna_delete_vrf_zita(tgen, r1):
     logger.info("Delete VRF ZITA and ensure that the route from VRF ZITA is deleted")
-    tgen = get_topogen()
     # Don't run this test if we have any failure.
-    if tgen.routers_have_failure():
+    if routers_have_failure(tgen, force=True):
         pytest.skip(tgen.errors)
 
-    r1 = tgen.gears["r1"]
     r1.cmd("ip link delete ZITA")
 
     # Test DONNA VRF.
@@ -485,16 +774,13 @@ def test_vrf_route_leak_donna_delete_vrf_zita():
         "172.16.101.0/24": None,
     }
 
-    test_func = partial(
-        topotest.router_json_cmp, r1, "show ip route vrf DONNA json", expect
-    )
-    result, diff = topotest.run_and_expect(test_func, None, count=10, wait=0.5)
+    test_func = json_poll(r1, "show ip route vrf DONNA json", expect)
+    result, diff = run_and_expect_backoff(test_func)
     assert result, "BGP VRF DONNA check failed:\n{}".format(diff)
 
 
-def test_memory_leak():
+def test_memory_leak(tgen):
     "Run the memory leak test and report results."
-    tgen = get_topogen()
     if not tgen.is_memleak_enabled():
         pytest.skip("Memory leak test/report is disabled")
 
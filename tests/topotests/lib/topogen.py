@@ -1005,7 +1005,7 @@ class TopoRouter(TopoGear):
             return output
 
         try:
-            return json.loads(output)
+            return topotest.json_loads(output)
         except ValueError as error:
             logger.warning(
                 "vtysh_cmd: %s: failed to convert json output: %s: %s",